@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Per-gym class schedule index for conflict detection and free-slot search
+
+Each gym's classes are kept as intervals sorted by start time. Because no
+class is longer than the gym's longest class, every interval that can
+overlap [start, end) begins in (start - longest, end), so overlap checks and
+free-slot lookups are a bisect plus a scan of the few neighbouring classes.
+
+Classes only carry a `schedule` start time, so every class is assumed to
+last DEFAULT_DURATION_MINUTES unless a duration is supplied.
+
+Usage:
+    python class_schedule.py conflicts
+    python class_schedule.py free --gym <gym-id> --date 2025-08-20 --duration 60
+    python class_schedule.py conflicts --mirror fitpass_mirror.db
+"""
+
+import argparse
+import sqlite3
+import sys
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+DEFAULT_DURATION_MINUTES = 60
+
+# Studio opening hours used by the free-slot search
+OPEN_HOUR = 6
+CLOSE_HOUR = 22
+
+
+def parse_time(value):
+    """datetime from a Supabase/ISO timestamp string (or a datetime)"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+
+
+class GymSchedule:
+    """Sorted (start, end, class_id) intervals for one gym"""
+
+    def __init__(self):
+        self.intervals = []
+        self.longest = timedelta(0)
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def add(self, start, end, class_id=None):
+        insort(self.intervals, (start, end, class_id or ''))
+        self.longest = max(self.longest, end - start)
+
+    def bulk_load(self, intervals):
+        """Add many (start, end, class_id) intervals with a single sort"""
+        self.intervals.extend((start, end, class_id or '') for start, end, class_id in intervals)
+        self.intervals.sort()
+        self.longest = max([self.longest] + [end - start for start, end, _ in self.intervals])
+
+    def overlapping(self, start, end):
+        """Intervals that intersect [start, end)"""
+        lo = bisect_left(self.intervals, (start - self.longest,))
+        hi = bisect_left(self.intervals, (end,))
+        return [iv for iv in self.intervals[lo:hi] if iv[1] > start]
+
+    def is_free(self, start, end):
+        return not self.overlapping(start, end)
+
+    def conflicts(self):
+        """Pairs of overlapping intervals, found in one sweep by start time"""
+        found = []
+        active = []
+        for interval in self.intervals:
+            active = [other for other in active if other[1] > interval[0]]
+            found.extend((other, interval) for other in active)
+            active.append(interval)
+        return found
+
+    def free_slots(self, window_start, window_end, duration):
+        """Gaps of at least `duration` within [window_start, window_end)"""
+        slots = []
+        cursor = window_start
+        for start, end, _ in self.overlapping(window_start, window_end):
+            if start - cursor >= duration:
+                slots.append((cursor, start))
+            cursor = max(cursor, end)
+        if window_end - cursor >= duration:
+            slots.append((cursor, window_end))
+        return slots
+
+    def next_free_slot(self, after, duration, until, open_hour=OPEN_HOUR, close_hour=CLOSE_HOUR):
+        """Earliest start >= after whose class fits in opening hours without overlap"""
+        candidate = after
+        while candidate + duration <= until:
+            opens = candidate.replace(hour=open_hour, minute=0, second=0, microsecond=0)
+            closes = candidate.replace(hour=close_hour, minute=0, second=0, microsecond=0)
+            if candidate < opens:
+                candidate = opens
+            if candidate + duration > closes:
+                candidate = opens + timedelta(days=1)
+                continue
+            blocking = self.overlapping(candidate, candidate + duration)
+            if not blocking:
+                return candidate
+            candidate = max(end for _, end, _ in blocking)
+        return None
+
+
+class ScheduleIndex:
+    """GymSchedule per gym_id"""
+
+    def __init__(self, duration=timedelta(minutes=DEFAULT_DURATION_MINUTES)):
+        self.duration = duration
+        self.gyms = defaultdict(GymSchedule)
+
+    def add_class(self, gym_id, start, class_id=None, duration=None):
+        start = parse_time(start)
+        self.gyms[gym_id].add(start, start + (duration or self.duration), class_id)
+
+    @classmethod
+    def from_rows(cls, rows, duration=timedelta(minutes=DEFAULT_DURATION_MINUTES)):
+        """Build from class rows with id, gym_id and schedule"""
+        index = cls(duration)
+        by_gym = defaultdict(list)
+        for row in rows:
+            if row.get('gym_id') and row.get('schedule'):
+                start = parse_time(row['schedule'])
+                by_gym[row['gym_id']].append((start, start + duration, row.get('id')))
+        for gym_id, intervals in by_gym.items():
+            index.gyms[gym_id].bulk_load(intervals)
+        return index
+
+    def conflicts(self):
+        return {gym_id: schedule.conflicts() for gym_id, schedule in self.gyms.items()}
+
+
+def load_rows(mirror_path=None):
+    """Class rows from the local mirror if given, otherwise streamed from Supabase"""
+    if mirror_path:
+        from local_mirror import connect_readonly
+        conn = connect_readonly(mirror_path)
+        try:
+            return [dict(row) for row in conn.execute('SELECT id, gym_id, schedule FROM classes')]
+        finally:
+            conn.close()
+
+    from supabase_client import supabase
+    from table_sampling import stream_rows
+    return stream_rows(supabase, 'classes', columns='id,gym_id,schedule')
+
+
+def main(argv=None):
+    """Report schedule conflicts or free slots"""
+    parser = argparse.ArgumentParser(description='Per-gym class schedule index')
+    parser.add_argument('--mirror', help='read classes from a local mirror database')
+    parser.add_argument('--duration', type=int, default=DEFAULT_DURATION_MINUTES, help='class length in minutes')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('conflicts', help='list overlapping classes per gym')
+
+    free_parser = subparsers.add_parser('free', help='list free slots for a gym on a date')
+    free_parser.add_argument('--gym', required=True)
+    free_parser.add_argument('--date', required=True, help='YYYY-MM-DD')
+
+    args = parser.parse_args(argv)
+    duration = timedelta(minutes=args.duration)
+    try:
+        index = ScheduleIndex.from_rows(load_rows(args.mirror), duration)
+    except sqlite3.Error as e:
+        print(f"❌ Cannot read classes from mirror {args.mirror}: {e}")
+        return 1
+    print(f"📅 Indexed {sum(len(s) for s in index.gyms.values())} classes across {len(index.gyms)} gyms")
+
+    if args.command == 'conflicts':
+        total = 0
+        for gym_id, pairs in index.conflicts().items():
+            for first, second in pairs:
+                print(f"❌ {gym_id}: {first[2]} ({first[0]:%Y-%m-%d %H:%M}) overlaps "
+                      f"{second[2]} ({second[0]:%Y-%m-%d %H:%M})")
+            total += len(pairs)
+        print(f"{'✅ No conflicts' if not total else f'❌ {total} conflicts'}")
+        return 1 if total else 0
+
+    schedule = index.gyms.get(args.gym, GymSchedule())
+    day = datetime.fromisoformat(args.date)
+    sample = next(iter(schedule.intervals), None)
+    if sample and sample[0].tzinfo:
+        day = day.replace(tzinfo=sample[0].tzinfo)
+    opens, closes = day.replace(hour=OPEN_HOUR), day.replace(hour=CLOSE_HOUR)
+    for start, end in schedule.free_slots(opens, closes, duration):
+        print(f"🟢 {start:%H:%M} - {end:%H:%M}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Batch refresh of precomputed class credit costs
+
+Calls refresh_class_credit_cost_cache (sql_migrations/07_create_class_credit_cost_cache.sql),
+which recomputes only the classes whose schedule, gym or pricing rules
+changed since they were last computed. Run it on a schedule (e.g. cron
+every few minutes). The function is only granted to service_role, so the
+refresh connects with SUPABASE_SERVICE_ROLE_KEY rather than the anon key.
+
+Usage:
+    python credit_cost_cache.py
+    python credit_cost_cache.py --full
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from supabase_client import SUPABASE_URL, create_client_for
+
+
+def refresh_credit_costs(full=False):
+    """Recompute changed classes (or all with full=True); returns classes written"""
+    service_role_key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY')
+    if not service_role_key:
+        print("❌ SUPABASE_SERVICE_ROLE_KEY not found in environment variables")
+        return None
+
+    mode = "full" if full else "incremental"
+    print(f"💰 Refreshing class credit costs ({mode})...")
+
+    start = time.perf_counter()
+    try:
+        client = create_client_for(SUPABASE_URL, service_role_key)
+        result = client.rpc('refresh_class_credit_cost_cache', {'p_full': full}).execute()
+    except Exception as e:
+        print(f"❌ Error refreshing credit costs: {e}")
+        return None
+
+    refreshed = result.data or 0
+    print(f"✅ Recomputed {refreshed} classes in {time.perf_counter() - start:.2f}s")
+    return refreshed
+
+
+def main(argv=None):
+    """Run one refresh"""
+    parser = argparse.ArgumentParser(description='Refresh precomputed class credit costs')
+    parser.add_argument('--full', action='store_true', help='recompute every class')
+    args = parser.parse_args(argv)
+    return 0 if refresh_credit_costs(args.full) is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Single-pass data-quality profiler for the Cabo FitPass tables
+
+Streams each table once and keeps a fixed-size summary per column: row and
+null counts, min/max, approximate distinct count (HyperLogLog) and the most
+frequent values (space-saving). Tables are profiled in parallel and the
+result is saved as JSON so later runs can be compared against it.
+
+Usage:
+    python data_profiler.py --output profiles/latest.json
+    python data_profiler.py --compare profiles/latest.json --output profiles/today.json
+    python data_profiler.py --mirror fitpass_mirror.db
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+PROFILE_TABLES = ['gyms', 'classes', 'bookings', 'profiles', 'plans', 'subscriptions',
+                  'payments', 'workouts', 'user_credits', 'credit_transactions', 'class_credit_costs']
+
+# 2^12 registers: ~1.6% standard error in 4 KB per column
+HLL_PRECISION = 12
+
+# Counters kept per column by space-saving, and values reported
+TOP_CAPACITY = 64
+TOP_REPORTED = 5
+
+
+def hash64(text):
+    """Stable 64-bit hash (unlike hash(), identical across processes)"""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'big')
+
+
+class HyperLogLog:
+    """Approximate distinct counter with 2^precision one-byte registers"""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+
+    def add(self, text):
+        value = hash64(text)
+        index = value >> (64 - self.precision)
+        remaining = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            # Small-range correction (linear counting)
+            estimate = self.size * math.log(self.size / zeros)
+        return int(round(estimate))
+
+
+class SpaceSaving:
+    """Top-k frequent values with a fixed number of counters"""
+
+    def __init__(self, capacity=TOP_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+
+    def add(self, text):
+        if text in self.counts:
+            self.counts[text] += 1
+        elif len(self.counts) < self.capacity:
+            self.counts[text] = 1
+        else:
+            # Replace the smallest counter; its count bounds the new value's error
+            smallest = min(self.counts, key=self.counts.get)
+            self.counts[text] = self.counts.pop(smallest) + 1
+
+    def top(self, n=TOP_REPORTED):
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+class ColumnProfile:
+    """Constant-memory summary of one column"""
+
+    def __init__(self):
+        self.rows = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.distinct = HyperLogLog()
+        self.top = SpaceSaving()
+
+    def add(self, value):
+        self.rows += 1
+        if value is None:
+            self.nulls += 1
+            return
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, sort_keys=True, default=str)
+        try:
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+        except TypeError:
+            # Mixed types in one column - compare as text
+            self.min = min(str(self.min), str(value))
+            self.max = max(str(self.max), str(value))
+        text = str(value)
+        self.distinct.add(text)
+        self.top.add(text)
+
+    def summary(self):
+        return {
+            'rows': self.rows,
+            'null_rate': round(self.nulls / self.rows, 4) if self.rows else 0.0,
+            'min': self.min,
+            'max': self.max,
+            'approx_distinct': self.distinct.count(),
+            'top_values': self.top.top(),
+        }
+
+
+def profile_rows(rows):
+    """Profile an iterable of dict rows in one pass"""
+    columns = {}
+    row_count = 0
+    for row in rows:
+        row_count += 1
+        for name, value in row.items():
+            if name not in columns:
+                columns[name] = ColumnProfile()
+                # Rows seen before this column first appeared count as nulls
+                columns[name].rows = columns[name].nulls = row_count - 1
+            columns[name].add(value)
+        for name, column in columns.items():
+            if name not in row:
+                column.add(None)
+    return {'rows': row_count, 'columns': {name: column.summary() for name, column in columns.items()}}
+
+
+def profile_table(table, mirror_path=None):
+    """Stream one table from Supabase (or the local mirror) and profile it"""
+    if mirror_path:
+        from local_mirror import connect_readonly
+        conn = connect_readonly(mirror_path)
+        try:
+            return profile_rows(dict(row) for row in conn.execute(f'SELECT * FROM "{table}"'))
+        finally:
+            conn.close()
+
+    from supabase_client import supabase
+    from table_sampling import stream_rows
+    return profile_rows(stream_rows(supabase, table))
+
+
+def profile_tables(tables, workers=4, mirror_path=None):
+    """Profile tables in parallel; failed tables are recorded with their error"""
+    def run(table):
+        try:
+            return table, profile_table(table, mirror_path)
+        except Exception as e:
+            return table, {'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(run, tables))
+
+
+def compare_profiles(previous, current):
+    """Lines describing row count, null rate and distinct changes between runs"""
+    changes = []
+    for table, profile in current['tables'].items():
+        before = previous['tables'].get(table)
+        if not before or 'error' in before or 'error' in profile:
+            continue
+        if before['rows'] != profile['rows']:
+            changes.append(f"{table}: rows {before['rows']} -> {profile['rows']}")
+        for name, column in profile['columns'].items():
+            old = before['columns'].get(name)
+            if old is None:
+                changes.append(f"{table}.{name}: new column")
+                continue
+            if abs(column['null_rate'] - old['null_rate']) >= 0.01:
+                changes.append(f"{table}.{name}: null rate {old['null_rate']:.2%} -> {column['null_rate']:.2%}")
+            if old['approx_distinct'] and abs(column['approx_distinct'] - old['approx_distinct']) / old['approx_distinct'] > 0.05:
+                changes.append(f"{table}.{name}: ~distinct {old['approx_distinct']} -> {column['approx_distinct']}")
+        for name in before['columns']:
+            if name not in profile['columns']:
+                changes.append(f"{table}.{name}: column removed")
+    return changes
+
+
+def print_profile(profile):
+    for table, result in profile['tables'].items():
+        if 'error' in result:
+            print(f"❌ {table}: {result['error']}")
+            continue
+        print(f"\n📊 {table.upper()} - {result['rows']} rows")
+        print("-" * 40)
+        for name, column in result['columns'].items():
+            top = ', '.join(f"{value[:20]}×{count}" for value, count in column['top_values'][:3])
+            print(f"  {name:<24} null {column['null_rate']:6.1%}  ~distinct {column['approx_distinct']:<8} "
+                  f"min {str(column['min'])[:20]!s:<20}  max {str(column['max'])[:20]!s:<20}  top {top}")
+
+
+def main(argv=None):
+    """Profile tables, save the result and optionally compare with a previous run"""
+    parser = argparse.ArgumentParser(description='Single-pass data-quality profiler')
+    parser.add_argument('tables', nargs='*',
+                        help='tables to profile (default: every app table, or every mirrored table with --mirror)')
+    parser.add_argument('--workers', type=int, default=4, help='tables profiled in parallel')
+    parser.add_argument('--mirror', help='profile the local mirror instead of Supabase')
+    parser.add_argument('--output', help='write the profile as JSON')
+    parser.add_argument('--compare', help='previous profile JSON to compare against')
+    args = parser.parse_args(argv)
+    if not args.tables:
+        from local_mirror import MIRROR_TABLES
+        args.tables = list(MIRROR_TABLES) if args.mirror else PROFILE_TABLES
+
+    started = datetime.now()
+    profile = {
+        'generated_at': started.isoformat(),
+        'source': args.mirror or 'supabase',
+        'tables': profile_tables(args.tables, args.workers, args.mirror),
+    }
+    print_profile(profile)
+    print(f"\n⏱️  Profiled {len(args.tables)} tables in {(datetime.now() - started).total_seconds():.2f}s")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(profile, f, indent=2, default=str)
+        print(f"✅ Saved profile to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        changes = compare_profiles(previous, profile)
+        print(f"\n🔍 Changes since {previous['generated_at']}:")
+        for change in changes:
+            print(f"  {change}")
+        if not changes:
+            print("  (none)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
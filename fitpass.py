@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Cabo FitPass database tooling - single entry point for the maintenance scripts
+
+Script modules are imported only when a step runs and the Supabase client is
+created on first query, so help, dry runs and offline steps start instantly.
+
+Usage:
+    python fitpass.py list
+    python fitpass.py verify
+    python fitpass.py run state clean-bookings generate-sql
+    python fitpass.py --dry-run run update verify
+    python fitpass.py load-test --workers 16 --operations 2000
+"""
+
+import argparse
+import importlib
+import sys
+
+# step name -> (module, function, touches network, description)
+STEPS = {
+    'analyze': ('analyze_supabase', 'main', True, 'Full schema and Lovable.io analysis'),
+    'analyze-schema': ('analyze_supabase', 'analyze_database', True, 'List tables and sample rows'),
+    'lovable-check': ('analyze_supabase', 'check_lovable_integration', True, 'Look for Lovable.io tables'),
+    'update': ('update_supabase', 'main', True, 'Clean data, create tables and add test data'),
+    'verify-data': ('update_supabase', 'verify_data', True, 'Count records in every app table'),
+    'manual': ('supabase_manual_updates', 'main', True, 'Run every manual update step'),
+    'state': ('supabase_manual_updates', 'analyze_current_state', True, 'Show current table contents'),
+    'clean-bookings': ('supabase_manual_updates', 'clean_bookings', True, 'Delete bookings for missing classes'),
+    'seed': ('supabase_manual_updates', 'add_more_test_data', True, 'Add a test gym and classes'),
+    'missing-tables': ('supabase_manual_updates', 'create_test_tables', False, 'Describe tables still to create'),
+    'generate-sql': ('supabase_manual_updates', 'generate_sql_scripts', False, 'Write SQL scripts for manual execution'),
+    'verify': ('final_verification', 'main', True, 'Final verification report'),
+    'files': ('final_verification', 'show_generated_files', False, 'Check generated files exist'),
+    'queries': ('final_verification', 'show_sql_queries', False, 'Print key SQL queries for Lovable.io'),
+    'status': ('final_verification', 'show_integration_status', False, 'Print integration status'),
+}
+
+# tool name -> (module, description); remaining arguments go to the module's main()
+TOOLS = {
+    'load-test': ('booking_load_test', 'Concurrent booking/cancel load against a local Postgres'),
+    'sample': ('table_sampling', 'Representative row samples per table'),
+    'mirror': ('local_mirror', 'Sync or query the local SQLite mirror'),
+    'seed-data': ('seed_data', 'Generate COPY seed CSV files or bulk-load them'),
+    'credit-costs': ('credit_cost_cache', 'Refresh precomputed class credit costs'),
+    'schedule': ('class_schedule', 'Find class schedule conflicts and free slots per gym'),
+    'profile': ('data_profiler', 'Single-pass data-quality profile of every table'),
+    'verify-envs': ('multi_env_verification', 'Verify several environments side by side with drift'),
+}
+
+
+def resolve_step(name):
+    """Import the module behind a step and return its function"""
+    module_name, func_name, _, _ = STEPS[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, func_name)
+
+
+def run_steps(names, dry_run=False):
+    """Run steps in order in this process, sharing one Supabase client"""
+    for name in names:
+        _, _, network, description = STEPS[name]
+        if dry_run:
+            where = "network" if network else "offline"
+            print(f"🔎 would run {name} ({where}): {description}")
+            continue
+        print(f"▶️  {name}: {description}")
+        resolve_step(name)()
+        print()
+    return 0
+
+
+def cmd_list(args):
+    """List available steps and tools"""
+    width = max(len(name) for name in list(STEPS) + list(TOOLS))
+    for name, (module_name, func_name, network, description) in STEPS.items():
+        where = "network" if network else "offline"
+        print(f"{name:<{width}}  {where:<7}  {module_name}.{func_name} - {description}")
+    for name, (module_name, description) in TOOLS.items():
+        print(f"{name:<{width}}  {'tool':<7}  {module_name} - {description}")
+    return 0
+
+
+def cmd_run(args):
+    """Run one or more steps in order"""
+    return run_steps(args.steps, args.dry_run)
+
+
+def cmd_tool(args):
+    """Hand the remaining arguments to a tool module's main()"""
+    module_name, description = TOOLS[args.command]
+    if args.dry_run:
+        print(f"🔎 would run {args.command} (tool): {module_name}.main({args.tool_args!r}) - {description}")
+        return 0
+    return importlib.import_module(module_name).main(args.tool_args)
+
+
+def build_parser():
+    """Build the argument parser with one subcommand per step"""
+    parser = argparse.ArgumentParser(prog='fitpass', description='Cabo FitPass database tooling')
+    parser.add_argument('--dry-run', action='store_true', help='show what would run without running it')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help='list available steps and tools')
+    list_parser.set_defaults(handler=cmd_list)
+
+    run_parser = subparsers.add_parser('run', help='run several steps in one process')
+    run_parser.add_argument('steps', nargs='+', choices=list(STEPS), metavar='STEP')
+    run_parser.set_defaults(handler=cmd_run)
+
+    for name, (_, _, _, description) in STEPS.items():
+        step_parser = subparsers.add_parser(name, help=description)
+        step_parser.set_defaults(handler=cmd_run, steps=[name])
+
+    for name, (_, description) in TOOLS.items():
+        tool_parser = subparsers.add_parser(name, help=description, add_help=False)
+        tool_parser.set_defaults(handler=cmd_tool)
+
+    return parser
+
+
+def main(argv=None):
+    """Parse arguments and dispatch to the chosen subcommand"""
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command in TOOLS:
+        args.tool_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
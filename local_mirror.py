@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Local SQLite mirror of the Cabo FitPass production tables
+
+Does an initial bulk load and then follows changes by keyset polling on each
+table's change column, so read-only tooling (verification, analytics,
+support lookups) can query a local file instead of production.
+
+Polling sees inserts and updates; rows deleted upstream disappear from the
+mirror on the next `sync --full`. gyms and classes have no maintained
+updated_at column, so they are polled on created_at and treated as
+insert-only: edits to existing gyms or classes only reach the mirror with
+`sync --full`. A full sync loads into a staging table and swaps it in, so
+readers keep seeing the previous copy until the reload is complete. Rows
+whose change column is NULL cannot be ordered by it, so they are paged by id
+and re-read on every sync.
+
+Usage:
+    python local_mirror.py sync --once
+    python local_mirror.py sync --interval 10
+    python local_mirror.py query "SELECT title, capacity FROM classes WHERE gym_id = ?" <gym-id>
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DEFAULT_DB_PATH = "fitpass_mirror.db"
+
+# table -> column that moves forward whenever a row is inserted or changed.
+# gyms and classes are insert-only here (created_at): edits need `sync --full`.
+MIRROR_TABLES = {
+    'gyms': 'created_at',
+    'classes': 'created_at',
+    'bookings': 'updated_at',
+    'profiles': 'updated_at',
+    'subscriptions': 'updated_at',
+    'user_credits': 'last_updated',
+    'credit_transactions': 'created_at',
+}
+
+# Secondary indexes created once the column shows up in the mirror
+MIRROR_INDEXES = {
+    'classes': ['gym_id', 'schedule'],
+    'bookings': ['user_id', 'class_id'],
+    'profiles': ['email'],
+    'subscriptions': ['user_id'],
+    'user_credits': ['user_id'],
+    'credit_transactions': ['user_id', 'booking_id'],
+}
+
+PAGE_SIZE = 1000
+
+# Re-read this far behind the cursor so rows committed late are not skipped
+OVERLAP_SECONDS = 5
+
+
+class SupabaseSource:
+    """Reads pages of rows from Supabase in (change column, id) order
+
+    With after_id None the page starts at after_value inclusive (used when
+    resuming from a rewound cursor); otherwise it starts strictly after the
+    (after_value, after_id) pair. Rows with a NULL change column come only
+    from fetch_null_page, in id order.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def fetch_page(self, table, cursor_column, after_value, after_id, limit):
+        query = self.client.table(table).select('*').not_.is_(cursor_column, 'null')
+        if after_value is not None and after_id is None:
+            query = query.gte(cursor_column, after_value)
+        elif after_value is not None:
+            query = query.or_(
+                f'{cursor_column}.gt."{after_value}",'
+                f'and({cursor_column}.eq."{after_value}",id.gt.{after_id})'
+            )
+        result = query.order(cursor_column).order('id').limit(limit).execute()
+        return result.data or []
+
+    def fetch_null_page(self, table, cursor_column, after_id, limit):
+        query = self.client.table(table).select('*').is_(cursor_column, 'null')
+        if after_id is not None:
+            query = query.gt('id', after_id)
+        result = query.order('id').limit(limit).execute()
+        return result.data or []
+
+
+class StaticSource:
+    """In-memory stand-in for Supabase, e.g. {'gyms': [{...}, ...]}"""
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    def fetch_page(self, table, cursor_column, after_value, after_id, limit):
+        rows = sorted((r for r in self.tables.get(table, []) if r.get(cursor_column) is not None),
+                      key=lambda r: (r[cursor_column], r['id']))
+        if after_value is not None and after_id is None:
+            rows = [r for r in rows if r[cursor_column] >= after_value]
+        elif after_value is not None:
+            rows = [r for r in rows if (r[cursor_column], r['id']) > (after_value, after_id)]
+        return rows[:limit]
+
+    def fetch_null_page(self, table, cursor_column, after_id, limit):
+        rows = sorted((r for r in self.tables.get(table, []) if r.get(cursor_column) is None),
+                      key=lambda r: r['id'])
+        if after_id is not None:
+            rows = [r for r in rows if r['id'] > after_id]
+        return rows[:limit]
+
+
+def _to_sqlite(value):
+    """Store nested JSON values as text, everything else as-is"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def _rewind(value, seconds):
+    """Move an ISO timestamp cursor back by `seconds`"""
+    try:
+        return (datetime.fromisoformat(value) - timedelta(seconds=seconds)).isoformat()
+    except (TypeError, ValueError):
+        return value
+
+
+def connect_readonly(path=DEFAULT_DB_PATH):
+    """Open an existing mirror read-only (a mistyped path fails instead of creating a file)"""
+    conn = sqlite3.connect(f'{Path(path).resolve().as_uri()}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class LocalMirror:
+    """SQLite file holding one table per mirrored production table"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS _sync_state (
+                table_name TEXT PRIMARY KEY,
+                cursor_column TEXT NOT NULL,
+                last_value TEXT,
+                last_id TEXT,
+                synced_at TEXT
+            )
+            """
+        )
+        self._columns = {}
+
+    def close(self):
+        self.conn.close()
+
+    def columns(self, table):
+        if table not in self._columns:
+            info = self.conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+            self._columns[table] = {row['name'] for row in info}
+        return self._columns[table]
+
+    def _ensure_columns(self, table, rows):
+        """Create the table or add columns for keys seen for the first time"""
+        existing = self.columns(table)
+        if not existing:
+            self.conn.execute(f'CREATE TABLE "{table}" (id TEXT PRIMARY KEY)')
+            existing.add('id')
+        for row in rows:
+            for key in row:
+                if key not in existing:
+                    self.conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{key}"')
+                    existing.add(key)
+        for column in MIRROR_INDEXES.get(table, []):
+            if column in existing:
+                self.conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{table}_{column}" ON "{table}"("{column}")'
+                )
+
+    def upsert(self, table, rows):
+        """Insert or replace rows by id"""
+        if not rows:
+            return
+        self._ensure_columns(table, rows)
+        for keys in {tuple(row) for row in rows}:
+            column_list = ', '.join(f'"{key}"' for key in keys)
+            placeholders = ', '.join('?' for _ in keys)
+            self.conn.executemany(
+                f'INSERT OR REPLACE INTO "{table}" ({column_list}) VALUES ({placeholders})',
+                [tuple(_to_sqlite(row[key]) for key in keys) for row in rows if tuple(row) == keys],
+            )
+
+    def cursor(self, table):
+        row = self.conn.execute(
+            "SELECT last_value, last_id FROM _sync_state WHERE table_name = ?", (table,)
+        ).fetchone()
+        return (row['last_value'], row['last_id']) if row else (None, None)
+
+    def save_cursor(self, table, cursor_column, last_value, last_id):
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO _sync_state (table_name, cursor_column, last_value, last_id, synced_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (table, cursor_column, last_value, last_id, datetime.now().isoformat()),
+        )
+
+    def reset(self, table):
+        """Drop a mirrored table and its cursor, e.g. a stale staging copy"""
+        self.conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self.conn.execute("DELETE FROM _sync_state WHERE table_name = ?", (table,))
+        self._columns.pop(table, None)
+        self.conn.commit()
+
+    def swap_in(self, staging, table):
+        """Replace a table and its cursor with a fully loaded staging copy in one transaction"""
+        self.conn.commit()
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+            self.conn.execute("DELETE FROM _sync_state WHERE table_name = ?", (table,))
+            if self.columns(staging):
+                self.conn.execute(f'ALTER TABLE "{staging}" RENAME TO "{table}"')
+                self.conn.execute(
+                    "UPDATE _sync_state SET table_name = ? WHERE table_name = ?", (table, staging)
+                )
+            self._columns.pop(staging, None)
+            self._columns.pop(table, None)
+            if self.columns(table):
+                self._ensure_columns(table, [])
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            self._columns.clear()
+            raise
+
+    def query(self, sql, params=()):
+        """Run a read-only query against the mirror and return dict rows"""
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def get(self, table, row_id):
+        rows = self.query(f'SELECT * FROM "{table}" WHERE id = ?', (row_id,))
+        return rows[0] if rows else None
+
+
+def sync_table(mirror, source, table, cursor_column, page_size=PAGE_SIZE, target=None):
+    """Pull rows changed since the cursor into `target` (default: table); returns rows applied"""
+    target = target or table
+    last_value, last_id = mirror.cursor(target)
+    if last_value is not None:
+        # Resume inclusively from the rewound timestamp; the id tiebreak only
+        # applies between pages of this run
+        last_value, last_id = _rewind(last_value, OVERLAP_SECONDS), None
+
+    applied = 0
+    while True:
+        rows = source.fetch_page(table, cursor_column, last_value, last_id, page_size)
+        if not rows:
+            break
+        mirror.upsert(target, rows)
+        applied += len(rows)
+        last_value, last_id = str(rows[-1][cursor_column]), str(rows[-1]['id'])
+        mirror.save_cursor(target, cursor_column, last_value, last_id)
+        mirror.conn.commit()
+        if len(rows) < page_size:
+            break
+
+    # Rows with no change value sit outside the cursor; page them by id alone
+    null_id = None
+    while True:
+        rows = source.fetch_null_page(table, cursor_column, null_id, page_size)
+        if not rows:
+            break
+        mirror.upsert(target, rows)
+        mirror.conn.commit()
+        applied += len(rows)
+        null_id = str(rows[-1]['id'])
+        if len(rows) < page_size:
+            break
+    return applied
+
+
+def sync_all(mirror, source, tables=None, full=False):
+    """Sync every mirrored table once and report rows applied per table"""
+    for table, cursor_column in MIRROR_TABLES.items():
+        if tables and table not in tables:
+            continue
+        try:
+            if full:
+                staging = f'{table}__staging'
+                mirror.reset(staging)
+                applied = sync_table(mirror, source, table, cursor_column, target=staging)
+                mirror.swap_in(staging, table)
+            else:
+                applied = sync_table(mirror, source, table, cursor_column)
+            print(f"✅ {table}: {applied} rows applied")
+        except Exception as e:
+            print(f"❌ Error syncing {table}: {e}")
+
+
+def main(argv=None):
+    """Sync the mirror or query it"""
+    parser = argparse.ArgumentParser(description='Local SQLite mirror of production tables')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='mirror database file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    sync_parser = subparsers.add_parser('sync', help='bulk load, then follow changes')
+    sync_parser.add_argument('--once', action='store_true', help='sync once and exit')
+    sync_parser.add_argument('--interval', type=float, default=10.0, help='seconds between polls')
+    sync_parser.add_argument('--full', action='store_true', help='reload the mirrored tables (via staging tables) first')
+    sync_parser.add_argument('--table', action='append', choices=list(MIRROR_TABLES), help='limit to a table')
+
+    query_parser = subparsers.add_parser('query', help='run a read-only SQL query against the mirror')
+    query_parser.add_argument('sql')
+    query_parser.add_argument('params', nargs='*')
+
+    args = parser.parse_args(argv)
+    mirror = LocalMirror(args.db)
+
+    try:
+        if args.command == 'query':
+            start = time.perf_counter()
+            rows = mirror.query(args.sql, args.params)
+            elapsed = (time.perf_counter() - start) * 1000
+            for row in rows:
+                print(json.dumps(row, default=str))
+            print(f"({len(rows)} rows, {elapsed:.2f} ms)", file=sys.stderr)
+            return 0
+
+        from supabase_client import supabase
+        source = SupabaseSource(supabase)
+
+        print(f"🔄 Syncing mirror {args.db}")
+        sync_all(mirror, source, args.table, args.full)
+        while not args.once:
+            time.sleep(args.interval)
+            sync_all(mirror, source, args.table)
+    except KeyboardInterrupt:
+        print("\n⏹️  Sync stopped")
+    finally:
+        mirror.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
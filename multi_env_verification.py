@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Parallel verification across several Supabase environments
+
+Checks every configured environment (e.g. staging, production and the local
+stack) at once, each with its own client and connection pool, and prints a
+side-by-side table of row counts and drift. Drift is found by streaming only
+the `id` column and comparing sorted arrays of 64-bit key hashes, so no full
+rows are transferred.
+
+Environments come from a JSON file:
+    [
+        {"name": "production", "url": "https://<ref>.supabase.co", "key_env": "PROD_SUPABASE_KEY"},
+        {"name": "staging", "url": "https://<ref>.supabase.co", "key_env": "STAGING_SUPABASE_KEY"},
+        {"name": "local", "url": "http://127.0.0.1:54321", "key": "<local anon key>"}
+    ]
+
+Usage:
+    python multi_env_verification.py --config environments.json
+    python multi_env_verification.py --config environments.json --no-drift gyms classes
+"""
+
+import argparse
+import json
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+
+from data_profiler import hash64
+from supabase_client import PROJECT_REF, SUPABASE_KEY, SUPABASE_URL, create_client_for
+from table_sampling import count_rows, stream_rows
+
+VERIFY_TABLES = ['gyms', 'classes', 'bookings', 'profiles', 'plans', 'subscriptions', 'payments', 'workouts']
+
+# Concurrent requests per environment
+POOL_SIZE = 4
+
+
+def load_environments(path=None):
+    """Environment configs from a JSON file, or the default project alone"""
+    if not path:
+        return [{'name': PROJECT_REF, 'url': SUPABASE_URL, 'key': SUPABASE_KEY}]
+    with open(path) as f:
+        environments = json.load(f)
+    if not isinstance(environments, list) or not environments:
+        raise ValueError(f"No environments configured in {path}")
+    for env in environments:
+        if not isinstance(env, dict) or not env.get('name') or not env.get('url'):
+            raise ValueError(f"Every environment needs a name and url, got {env!r}")
+        if 'key_env' in env:
+            env['key'] = os.environ.get(env['key_env'])
+        if not env.get('key'):
+            raise ValueError(f"No API key for environment {env['name']}")
+    return environments
+
+
+def key_hashes(client, table):
+    """Sorted 64-bit hashes of every id in a table (8 bytes per row), keyset-paged on id"""
+    return array('Q', sorted(hash64(str(row['id'])) for row in stream_rows(client, table, columns='id')))
+
+
+def contains(sorted_hashes, value):
+    i = bisect_left(sorted_hashes, value)
+    return i < len(sorted_hashes) and sorted_hashes[i] == value
+
+
+def verify_environment(env, tables, drift=True, pool_size=POOL_SIZE):
+    """Count (and hash keys of) every table in one environment"""
+    client = create_client_for(env['url'], env['key'])
+
+    def check(table):
+        try:
+            result = {'count': count_rows(client, table, 'exact')}
+            if drift:
+                result['hashes'] = key_hashes(client, table)
+            return table, result
+        except Exception as e:
+            return table, {'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=pool_size) as pool:
+        return dict(pool.map(check, tables))
+
+
+def verify_environments(environments, tables, drift=True, pool_size=POOL_SIZE):
+    """Verify all environments concurrently; returns {env name: {table: result}}"""
+    with ThreadPoolExecutor(max_workers=len(environments)) as pool:
+        futures = {
+            env['name']: pool.submit(verify_environment, env, tables, drift, pool_size)
+            for env in environments
+        }
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                # e.g. the client could not be created: every table fails
+                results[name] = {table: {'error': str(e)} for table in tables}
+        return results
+
+
+def drift_counts(results, table):
+    """Rows per environment whose id is missing from at least one other environment"""
+    hashes = {name: tables[table]['hashes'] for name, tables in results.items()
+              if 'hashes' in tables.get(table, {})}
+    counts = {}
+    for name, own in hashes.items():
+        others = [other for other_name, other in hashes.items() if other_name != name]
+        counts[name] = sum(1 for value in own if not all(contains(other, value) for other in others))
+    return counts
+
+
+def print_report(results, tables, drift=True):
+    """Print the side-by-side table; returns (drifted table/environment pairs, failed checks)"""
+    names = list(results)
+    width = max([12] + [len(name) + 2 for name in names])
+    print(f"\n{'TABLE':<16}" + ''.join(f"{name:>{width}}" for name in names))
+    print("-" * (16 + width * len(names)))
+
+    drifted = 0
+    for table in tables:
+        extras = drift_counts(results, table) if drift else {}
+        cells = []
+        for name in names:
+            result = results[name].get(table, {})
+            if 'error' in result:
+                cells.append(f"{'error':>{width}}")
+                continue
+            cell = str(result['count'])
+            if extras.get(name):
+                cell += f" (+{extras[name]})"
+                drifted += 1
+            cells.append(f"{cell:>{width}}")
+        print(f"{table:<16}" + ''.join(cells))
+
+    errors = 0
+    for name in names:
+        for table, result in results[name].items():
+            if 'error' in result:
+                print(f"❌ {name}.{table}: {result['error']}")
+                errors += 1
+
+    if drift:
+        print("\n(+n) = rows whose id is missing from at least one other environment")
+        if errors:
+            print(f"⚠️  Drift was computed without the {errors} failed table/environment checks above")
+        if drifted:
+            print(f"⚠️  Drift found in {drifted} table/environment pairs")
+        elif not errors:
+            print("✅ No drift between environments")
+    if errors:
+        print(f"❌ {errors} table/environment checks failed")
+    return drifted, errors
+
+
+def main(argv=None):
+    """Verify all configured environments side by side"""
+    parser = argparse.ArgumentParser(description='Parallel multi-environment verification')
+    parser.add_argument('tables', nargs='*', default=VERIFY_TABLES, help='tables to verify')
+    parser.add_argument('--config', default=os.environ.get('FITPASS_ENVIRONMENTS'),
+                        help='JSON list of environments (default: $FITPASS_ENVIRONMENTS or the main project)')
+    parser.add_argument('--pool-size', type=int, default=POOL_SIZE, help='concurrent requests per environment')
+    parser.add_argument('--no-drift', action='store_true', help='only compare counts')
+    args = parser.parse_args(argv)
+
+    try:
+        environments = load_environments(args.config)
+    except (OSError, ValueError) as e:
+        print(f"❌ Invalid environment config {args.config}: {e}")
+        return 1
+    print(f"🔍 Verifying {len(environments)} environments: {', '.join(env['name'] for env in environments)}")
+    results = verify_environments(environments, args.tables, not args.no_drift, args.pool_size)
+    drifted, errors = print_report(results, args.tables, not args.no_drift)
+    return 1 if drifted or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+-- Migration 06: Create Table Sampling Function
+-- Execute in Supabase SQL Editor
+
+-- Returns up to p_limit random rows of a public table as JSONB.
+-- Uses TABLESAMPLE SYSTEM sized from the planner's row estimate so large
+-- tables only read a few pages instead of being scanned for "first N" rows.
+CREATE OR REPLACE FUNCTION sample_table_rows(
+    p_table TEXT,
+    p_limit INTEGER DEFAULT 20
+)
+RETURNS SETOF JSONB AS $$
+DECLARE
+    v_reltuples REAL;
+    v_percent DOUBLE PRECISION;
+BEGIN
+    IF p_limit <= 0 THEN
+        RAISE EXCEPTION 'Sample limit must be positive';
+    END IF;
+
+    SELECT reltuples INTO v_reltuples
+    FROM pg_class
+    WHERE oid = format('public.%I', p_table)::regclass;
+
+    -- Oversample ~4x so the LIMIT is nearly always filled; small or
+    -- never-analyzed tables (reltuples <= 0) are read in full
+    IF v_reltuples IS NULL OR v_reltuples <= p_limit * 4 THEN
+        v_percent := 100;
+    ELSE
+        v_percent := GREATEST(0.0001, LEAST(100, 400.0 * p_limit / v_reltuples));
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        'SELECT to_jsonb(t) FROM public.%I AS t TABLESAMPLE SYSTEM (%s) ORDER BY random() LIMIT %s',
+        p_table, v_percent, p_limit
+    );
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY INVOKER;
+
+-- Grant execute permissions (RLS still applies because of SECURITY INVOKER)
+GRANT EXECUTE ON FUNCTION sample_table_rows TO authenticated;
+GRANT EXECUTE ON FUNCTION sample_table_rows TO service_role;
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE '✅ Migration 06 completed: Table sampling function created';
+    RAISE NOTICE '🎲 Function available: sample_table_rows(table_name, limit)';
+END $$;
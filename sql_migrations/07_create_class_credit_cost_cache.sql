@@ -0,0 +1,280 @@
+-- Migration 07: Precomputed Class Credit Costs
+-- Execute in Supabase SQL Editor (after Migration 05)
+
+-- One row per class holding the result of the class_credit_costs rules, so
+-- get_class_credit_cost becomes two primary key lookups plus one time
+-- comparison (the last-minute rule still depends on when the booking is made).
+CREATE TABLE IF NOT EXISTS class_credit_cost_cache (
+    class_id UUID PRIMARY KEY REFERENCES classes(id) ON DELETE CASCADE,
+    gym_id UUID,
+    cost_rule_id UUID, -- class_credit_costs row used, NULL = built-in default
+    class_start_time TIMESTAMP WITH TIME ZONE,
+
+    standard_credit_cost INTEGER NOT NULL, -- base or peak cost, weekend multiplier applied
+    last_minute_credit_cost INTEGER NOT NULL, -- weekend multiplier applied
+    last_minute_threshold_hours INTEGER, -- NULL = no last-minute pricing
+
+    valid_until DATE, -- expiry_date of the rule used; recompute after this
+    computed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_class_credit_cost_cache_gym_id ON class_credit_cost_cache(gym_id);
+CREATE INDEX IF NOT EXISTS idx_class_credit_costs_updated_at ON class_credit_costs(updated_at);
+
+-- Enable RLS
+ALTER TABLE class_credit_cost_cache ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Anyone can view precomputed credit costs"
+  ON class_credit_cost_cache FOR SELECT
+  USING (true);
+
+GRANT SELECT ON class_credit_cost_cache TO authenticated;
+GRANT ALL ON class_credit_cost_cache TO service_role;
+
+-- Original rule evaluation from Migration 05, kept as the fallback for
+-- classes that have not been precomputed yet
+CREATE OR REPLACE FUNCTION compute_class_credit_cost(
+    p_class_id UUID,
+    p_booking_datetime TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_cost INTEGER;
+    v_class_record RECORD;
+    v_cost_record RECORD;
+    v_is_peak BOOLEAN DEFAULT false;
+    v_is_last_minute BOOLEAN DEFAULT false;
+    v_is_weekend BOOLEAN DEFAULT false;
+    v_weekend_multiplier DECIMAL DEFAULT 1.0;
+    v_final_cost DECIMAL;
+BEGIN
+    SELECT c.*, g.name as gym_name
+    INTO v_class_record
+    FROM classes c
+    JOIN gyms g ON c.gym_id = g.id
+    WHERE c.id = p_class_id;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Class not found';
+    END IF;
+
+    SELECT *
+    INTO v_cost_record
+    FROM class_credit_costs
+    WHERE class_id = p_class_id
+        AND is_active = true
+        AND (expiry_date IS NULL OR expiry_date > CURRENT_DATE)
+    ORDER BY effective_date DESC
+    LIMIT 1;
+
+    IF NOT FOUND THEN
+        SELECT *
+        INTO v_cost_record
+        FROM class_credit_costs
+        WHERE gym_id = v_class_record.gym_id
+            AND class_id IS NULL
+            AND is_active = true
+            AND (expiry_date IS NULL OR expiry_date > CURRENT_DATE)
+        ORDER BY effective_date DESC
+        LIMIT 1;
+    END IF;
+
+    IF NOT FOUND THEN
+        v_cost := 1;
+        v_weekend_multiplier := 1.0;
+    ELSE
+        IF v_cost_record.peak_hours_start IS NOT NULL AND v_cost_record.peak_hours_end IS NOT NULL THEN
+            v_is_peak := EXTRACT(HOUR FROM v_class_record.start_time) BETWEEN
+                EXTRACT(HOUR FROM v_cost_record.peak_hours_start) AND
+                EXTRACT(HOUR FROM v_cost_record.peak_hours_end);
+        END IF;
+
+        IF v_cost_record.last_minute_threshold_hours IS NOT NULL THEN
+            v_is_last_minute := (v_class_record.start_time - p_booking_datetime) <=
+                (v_cost_record.last_minute_threshold_hours || ' hours')::INTERVAL;
+        END IF;
+
+        v_is_weekend := EXTRACT(DOW FROM v_class_record.start_time) IN (0, 6);
+
+        IF v_is_last_minute THEN
+            v_cost := v_cost_record.last_minute_credit_cost;
+        ELSIF v_is_peak THEN
+            v_cost := v_cost_record.peak_credit_cost;
+        ELSE
+            v_cost := v_cost_record.base_credit_cost;
+        END IF;
+
+        v_weekend_multiplier := CASE WHEN v_is_weekend THEN v_cost_record.weekend_multiplier ELSE 1.0 END;
+    END IF;
+
+    v_final_cost := v_cost * v_weekend_multiplier;
+
+    RETURN CEIL(v_final_cost);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Batch refresh: recompute every class whose inputs changed since it was
+-- last computed (or every class when p_full), in one set-based statement.
+-- Returns the number of classes written.
+CREATE OR REPLACE FUNCTION refresh_class_credit_cost_cache(p_full BOOLEAN DEFAULT false)
+RETURNS INTEGER AS $$
+DECLARE
+    v_refreshed INTEGER;
+BEGIN
+    WITH stale AS (
+        SELECT c.id, c.gym_id, c.start_time
+        FROM classes c
+        LEFT JOIN class_credit_cost_cache cache ON cache.class_id = c.id
+        WHERE p_full
+            OR cache.class_id IS NULL
+            OR cache.class_start_time IS DISTINCT FROM c.start_time
+            OR cache.gym_id IS DISTINCT FROM c.gym_id
+            OR cache.valid_until <= CURRENT_DATE
+            OR EXISTS (
+                SELECT 1 FROM class_credit_costs ccc
+                WHERE (ccc.class_id = c.id OR (ccc.class_id IS NULL AND ccc.gym_id = c.gym_id))
+                    AND ccc.updated_at > cache.computed_at
+            )
+    ),
+    ruled AS (
+        SELECT s.id, s.gym_id, s.start_time, rule.*
+        FROM stale s
+        LEFT JOIN LATERAL (
+            -- Class-specific rule first, then the gym default, as in compute_class_credit_cost
+            SELECT ccc.id AS rule_id, ccc.base_credit_cost, ccc.peak_credit_cost,
+                   ccc.last_minute_credit_cost, ccc.peak_hours_start, ccc.peak_hours_end,
+                   ccc.last_minute_threshold_hours, ccc.weekend_multiplier, ccc.expiry_date
+            FROM class_credit_costs ccc
+            WHERE ccc.is_active = true
+                AND (ccc.expiry_date IS NULL OR ccc.expiry_date > CURRENT_DATE)
+                AND (ccc.class_id = s.id OR (ccc.class_id IS NULL AND ccc.gym_id = s.gym_id))
+            ORDER BY (ccc.class_id IS NULL), ccc.effective_date DESC
+            LIMIT 1
+        ) rule ON true
+    ),
+    priced AS (
+        SELECT
+            r.*,
+            CASE WHEN r.rule_id IS NOT NULL AND EXTRACT(DOW FROM r.start_time) IN (0, 6)
+                 THEN r.weekend_multiplier ELSE 1.0 END AS multiplier,
+            r.peak_hours_start IS NOT NULL AND r.peak_hours_end IS NOT NULL
+                AND EXTRACT(HOUR FROM r.start_time) BETWEEN
+                    EXTRACT(HOUR FROM r.peak_hours_start) AND EXTRACT(HOUR FROM r.peak_hours_end)
+                AS is_peak
+        FROM ruled r
+    )
+    INSERT INTO class_credit_cost_cache (
+        class_id, gym_id, cost_rule_id, class_start_time,
+        standard_credit_cost, last_minute_credit_cost, last_minute_threshold_hours,
+        valid_until, computed_at
+    )
+    SELECT
+        p.id,
+        p.gym_id,
+        p.rule_id,
+        p.start_time,
+        CASE
+            WHEN p.rule_id IS NULL THEN 1
+            WHEN p.is_peak THEN CEIL(p.peak_credit_cost * p.multiplier)
+            ELSE CEIL(p.base_credit_cost * p.multiplier)
+        END,
+        CASE
+            WHEN p.rule_id IS NULL THEN 1
+            ELSE CEIL(p.last_minute_credit_cost * p.multiplier)
+        END,
+        p.last_minute_threshold_hours,
+        p.expiry_date,
+        NOW()
+    FROM priced p
+    ON CONFLICT (class_id) DO UPDATE SET
+        gym_id = EXCLUDED.gym_id,
+        cost_rule_id = EXCLUDED.cost_rule_id,
+        class_start_time = EXCLUDED.class_start_time,
+        standard_credit_cost = EXCLUDED.standard_credit_cost,
+        last_minute_credit_cost = EXCLUDED.last_minute_credit_cost,
+        last_minute_threshold_hours = EXCLUDED.last_minute_threshold_hours,
+        valid_until = EXCLUDED.valid_until,
+        computed_at = EXCLUDED.computed_at;
+
+    GET DIAGNOSTICS v_refreshed = ROW_COUNT;
+    RETURN v_refreshed;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Hot path: precomputed lookup, falling back to full rule evaluation for
+-- classes the batch job has not reached yet
+CREATE OR REPLACE FUNCTION get_class_credit_cost(
+    p_class_id UUID,
+    p_booking_datetime TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_cache RECORD;
+    v_start_time TIMESTAMP WITH TIME ZONE;
+BEGIN
+    SELECT * INTO v_cache
+    FROM class_credit_cost_cache
+    WHERE class_id = p_class_id
+        AND (valid_until IS NULL OR valid_until > CURRENT_DATE);
+
+    IF NOT FOUND THEN
+        RETURN compute_class_credit_cost(p_class_id, p_booking_datetime);
+    END IF;
+
+    -- A class rescheduled since the last refresh may change peak, weekend and
+    -- last-minute pricing, so only trust the cache for the live start time
+    SELECT start_time INTO v_start_time
+    FROM classes
+    WHERE id = p_class_id;
+
+    IF v_start_time IS DISTINCT FROM v_cache.class_start_time THEN
+        RETURN compute_class_credit_cost(p_class_id, p_booking_datetime);
+    END IF;
+
+    IF v_cache.last_minute_threshold_hours IS NOT NULL
+        AND (v_cache.class_start_time - p_booking_datetime) <=
+            (v_cache.last_minute_threshold_hours || ' hours')::INTERVAL THEN
+        RETURN v_cache.last_minute_credit_cost;
+    END IF;
+
+    RETURN v_cache.standard_credit_cost;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Deleted rules leave no updated_at for the incremental refresh to see, so
+-- drop the cache rows they priced (and those of a rule moved to another class
+-- or gym); get_class_credit_cost computes those classes live until the next refresh
+CREATE OR REPLACE FUNCTION invalidate_class_credit_cost_cache()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF OLD.class_id IS NOT NULL THEN
+        DELETE FROM class_credit_cost_cache WHERE class_id = OLD.class_id;
+    ELSE
+        DELETE FROM class_credit_cost_cache WHERE gym_id = OLD.gym_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS class_credit_costs_invalidate_cache ON class_credit_costs;
+CREATE TRIGGER class_credit_costs_invalidate_cache
+    AFTER DELETE OR UPDATE OF class_id, gym_id ON class_credit_costs
+    FOR EACH ROW
+    EXECUTE FUNCTION invalidate_class_credit_cost_cache();
+
+-- Grant execute permissions
+GRANT EXECUTE ON FUNCTION get_class_credit_cost TO authenticated;
+GRANT EXECUTE ON FUNCTION compute_class_credit_cost TO authenticated;
+GRANT EXECUTE ON FUNCTION refresh_class_credit_cost_cache TO service_role;
+
+-- Initial fill
+SELECT refresh_class_credit_cost_cache(true) AS classes_precomputed;
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE '✅ Migration 07 completed: Class credit costs precomputed';
+    RAISE NOTICE '⚡ get_class_credit_cost now reads class_credit_cost_cache';
+    RAISE NOTICE '🔄 Refresh changed classes with: SELECT refresh_class_credit_cost_cache();';
+    RAISE NOTICE '🗑️  Deleting a class_credit_costs rule invalidates the classes it priced';
+END $$;
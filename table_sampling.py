@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Representative table sampling for the Cabo FitPass analysis scripts
+
+Samples come from the sample_table_rows RPC (TABLESAMPLE on the server,
+sql_migrations/06_create_sampling_function.sql) when it is installed, and
+otherwise from a streaming reservoir sample over paged reads, so memory
+stays bounded by the sample budget whatever the table size.
+
+Usage:
+    python table_sampling.py classes bookings --budget 10
+"""
+
+import argparse
+import random
+import sys
+
+from supabase_client import supabase
+
+# Rows kept per table
+SAMPLE_BUDGET = 5
+
+# Rows fetched per request when streaming a table
+PAGE_SIZE = 1000
+
+
+def reservoir_sample(rows, budget, rng=None):
+    """Uniform sample of at most `budget` items from an iterable in one pass"""
+    rng = rng or random.Random()
+    reservoir = []
+    for seen, row in enumerate(rows):
+        if seen < budget:
+            reservoir.append(row)
+        else:
+            slot = rng.randrange(seen + 1)
+            if slot < budget:
+                reservoir[slot] = row
+    return reservoir
+
+
+def stream_rows(client, table, page_size=PAGE_SIZE, order_column='id', columns='*'):
+    """Yield every row of a table page by page, keyset-paged on a unique column
+
+    Each page starts after the last key seen, so every request is an index
+    range scan and rows inserted mid-stream cannot shift or repeat a page.
+    `columns` must include `order_column`.
+    """
+    last_key = None
+    while True:
+        query = client.table(table).select(columns)
+        if last_key is not None:
+            query = query.gt(order_column, last_key)
+        result = query.order(order_column).limit(page_size).execute()
+        rows = result.data or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last_key = rows[-1][order_column]
+
+
+def count_rows(client, table, method='estimated'):
+    """Row count from PostgREST without transferring the rows (estimated on large tables by default)"""
+    result = client.table(table).select('*', count=method).limit(1).execute()
+    return result.count
+
+
+def sample_rows(client, table, budget=SAMPLE_BUDGET, rng=None):
+    """Return (rows, method) with at most `budget` representative rows"""
+    try:
+        result = client.rpc('sample_table_rows', {'p_table': table, 'p_limit': budget}).execute()
+        if result.data is not None:
+            return result.data, 'server'
+    except Exception:
+        # Function not installed or not permitted - fall back to streaming
+        pass
+    return reservoir_sample(stream_rows(client, table), budget, rng), 'reservoir'
+
+
+def render_value(value, max_value=40):
+    """Single-line, truncated representation of a column value"""
+    text = str(value).replace('\n', ' ')
+    if len(text) > max_value:
+        text = text[:max_value - 1] + '…'
+    return text
+
+
+def render_row(row, max_value=40, max_width=160):
+    """Compact one-line `key=value` rendering of a record"""
+    line = ', '.join(f"{key}={render_value(value, max_value)}" for key, value in row.items())
+    if len(line) > max_width:
+        line = line[:max_width - 1] + '…'
+    return line
+
+
+def print_sample(client, table, budget=SAMPLE_BUDGET, indent="   "):
+    """Print a compact representative sample of a table"""
+    rows, method = sample_rows(client, table, budget)
+    print(f"{indent}Sample ({len(rows)} rows, {method}):")
+    for row in rows:
+        print(f"{indent}  {render_row(row)}")
+    return rows
+
+
+def main(argv=None):
+    """Sample the given tables"""
+    parser = argparse.ArgumentParser(description='Representative table samples')
+    parser.add_argument('tables', nargs='+', help='tables to sample')
+    parser.add_argument('--budget', type=int, default=SAMPLE_BUDGET, help='rows per table')
+    args = parser.parse_args(argv)
+
+    for table in args.tables:
+        try:
+            print(f"📊 {table}: ~{count_rows(supabase, table)} records")
+            print_sample(supabase, table, args.budget)
+        except Exception as e:
+            print(f"❌ Error sampling {table}: {e}")
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
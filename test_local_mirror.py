@@ -0,0 +1,86 @@
+"""
+Tests for the local SQLite mirror (python -m pytest test_local_mirror.py)
+"""
+
+import uuid
+
+import pytest
+
+from local_mirror import LocalMirror, StaticSource, sync_all, sync_table
+
+GYM_A = '00000000-0000-0000-0000-00000000000a'
+GYM_B = '00000000-0000-0000-0000-00000000000b'
+GYM_C = '00000000-0000-0000-0000-00000000000c'
+
+
+class UuidCheckingSource(StaticSource):
+    """Rejects the id tiebreak unless it is a uuid, like PostgREST on a uuid column"""
+
+    def fetch_page(self, table, cursor_column, after_value, after_id, limit):
+        if after_id is not None:
+            uuid.UUID(after_id)
+        return super().fetch_page(table, cursor_column, after_value, after_id, limit)
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = LocalMirror(str(tmp_path / 'mirror.db'))
+    yield mirror
+    mirror.close()
+
+
+def test_sync_table_resumes_from_rewound_cursor(mirror):
+    source = UuidCheckingSource({'bookings': [
+        {'id': GYM_A, 'updated_at': '2025-08-01T10:00:00+00:00', 'type': 'drop-in'},
+        {'id': GYM_B, 'updated_at': '2025-08-01T10:00:01+00:00', 'type': 'drop-in'},
+    ]})
+    assert sync_table(mirror, source, 'bookings', 'updated_at', page_size=1) == 2
+
+    source.tables['bookings'][1]['type'] = 'subscription'
+    source.tables['bookings'].append(
+        {'id': GYM_C, 'updated_at': '2025-08-01T10:00:02+00:00', 'type': 'drop-in'}
+    )
+    sync_table(mirror, source, 'bookings', 'updated_at', page_size=1)
+
+    assert mirror.get('bookings', GYM_B)['type'] == 'subscription'
+    assert mirror.get('bookings', GYM_C) is not None
+    assert mirror.cursor('bookings') == ('2025-08-01T10:00:02+00:00', GYM_C)
+
+
+def test_full_sync_swaps_in_staging_table(mirror):
+    source = StaticSource({'gyms': [
+        {'id': GYM_A, 'created_at': '2025-08-01T10:00:00+00:00', 'name': 'Old name'},
+        {'id': GYM_B, 'created_at': '2025-08-01T10:00:01+00:00', 'name': 'Closed'},
+    ]})
+    sync_all(mirror, source, ['gyms'])
+
+    source.tables['gyms'] = [{'id': GYM_A, 'created_at': '2025-08-01T10:00:00+00:00', 'name': 'New name'}]
+    sync_all(mirror, source, ['gyms'], full=True)
+
+    assert mirror.query('SELECT id, name FROM gyms') == [{'id': GYM_A, 'name': 'New name'}]
+    assert mirror.cursor('gyms') == ('2025-08-01T10:00:00+00:00', GYM_A)
+    assert mirror.cursor('gyms__staging') == (None, None)
+    assert not mirror.columns('gyms__staging')
+
+
+def test_sync_table_mirrors_rows_with_null_change_column(mirror):
+    ids = [f'00000000-0000-0000-0000-00000000000{i}' for i in range(1, 6)]
+    source = UuidCheckingSource({'gyms': [
+        {'id': ids[0], 'created_at': '2025-08-01T10:00:00+00:00', 'name': 'Dated'},
+    ] + [{'id': gym_id, 'created_at': None, 'name': 'Undated'} for gym_id in ids[1:]]})
+
+    assert sync_table(mirror, source, 'gyms', 'created_at', page_size=2) == 5
+    assert mirror.query('SELECT COUNT(*) AS n FROM gyms') == [{'n': 5}]
+    assert mirror.cursor('gyms') == ('2025-08-01T10:00:00+00:00', ids[0])
+
+    source.tables['gyms'][1]['name'] = 'Renamed'
+    sync_table(mirror, source, 'gyms', 'created_at', page_size=2)
+    assert mirror.get('gyms', ids[1])['name'] == 'Renamed'
+
+
+def test_sync_table_with_only_null_change_column_terminates(mirror):
+    source = StaticSource({'gyms': [
+        {'id': f'00000000-0000-0000-0000-00000000000{i}', 'created_at': None} for i in range(1, 6)
+    ]})
+    assert sync_table(mirror, source, 'gyms', 'created_at', page_size=2) == 5
+    assert mirror.cursor('gyms') == (None, None)